@@ -1,35 +1,75 @@
 # action_logs/admin.py
+import functools
+import json
+import re
+from types import MappingProxyType
+from urllib.parse import urlencode
 from django.contrib import admin
-from django.contrib.contenttypes.admin import GenericTabularInline
-from django.contrib.contenttypes.models import ContentType
-from django.utils.html import format_html
-from django.urls import reverse
-from .models import ActionLog, Blog, Comment, UserProfile
+from django.contrib.admin.utils import quote
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import CharField, Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Cast, Coalesce
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
+from django.utils.html import format_html, format_html_join
+from django.urls import NoReverseMatch, reverse
+from .models import ActionLog, Blog, Comment, UserProfile, get_content_type
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-class ActionLogInline(GenericTabularInline):
-    model = ActionLog
-    extra = 0
-    max_num = 10
-    can_delete = False
-    readonly_fields = ['action_type', 'timestamp', 'user', 'description', 'ip_address', 'link_to_object']
-    
-    def link_to_object(self, obj):
-        if not obj.content_object:
-            return "-"
-        try:
-            url = reverse(f'admin:{obj.content_type.app_label}_{obj.content_type.model}_change', args=[obj.object_id])
-            return format_html('<a href="{}">{}</a>', url, str(obj.content_object)[:50])
-        except:
-            return str(obj.content_object)[:50]
-    
-    link_to_object.short_description = "Об'єкт"
-    
-    def has_add_permission(self, request, obj=None):
-        return False
-    
-    def has_change_permission(self, request, obj=None):
-        return False
+
+ACTION_TYPE_ICONS = MappingProxyType({
+    'create': '📝', 'update': '🔄', 'delete': '🗑️', 'view': '👁️', 'login': '🔑',
+    'logout': '🚪', 'download': '⬇️', 'upload': '⬆️', 'share': '📤', 'other': '⚙️',
+})
+
+BROWSER_RE = re.compile(r'(chrome|firefox|safari|edge|opera)', re.IGNORECASE)
+
+
+def _dump_json(value):
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False).encode()
+
+
+@functools.lru_cache(maxsize=256)
+def _admin_url(name, *args):
+    try:
+        return reverse(f'admin:{name}', args=args)
+    except NoReverseMatch:
+        return None
+
+
+def _admin_change_url(app_label, model, object_id):
+    template = _admin_url(f'{app_label}_{model}_change', 0)
+    if template is None:
+        return None
+    head, _, tail = template.rpartition('/0/')
+    return f'{head}/{quote(object_id)}/{tail}'
+
+
+class FasterAdminPaginator(Paginator):
+    estimate_threshold = 10000
+    
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql' or query.where:
+            return super().count
+        
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [query.model._meta.db_table])
+            row = cursor.fetchone()
+        
+        estimate = row[0] if row else 0
+        if estimate < self.estimate_threshold:
+            return super().count
+        return estimate
 
 
 @admin.register(ActionLog)
@@ -44,19 +84,25 @@ class ActionLogAdmin(admin.ModelAdmin):
         ('Додатково', {'fields': ('full_description', 'ip_address', 'user_agent_display')}),
     )
     list_per_page = 50
+    paginator = FasterAdminPaginator
+    show_full_result_count = False
+    list_select_related = ('user', 'content_type')
     actions = ['export_as_json']
     
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related('content_object')
+    
     def action_type_icon(self, obj):
-        icons = {'create': '📝', 'update': '🔄', 'delete': '🗑️', 'view': '👁️', 'login': '🔑', 'logout': '🚪', 'download': '⬇️', 'upload': '⬆️', 'share': '📤', 'other': '⚙️'}
-        icon = icons.get(obj.action_type, '❓')
-        return format_html('<span title="{}">{} {}</span>', obj.get_action_type_display(), icon, obj.get_action_type_display())
+        icon = ACTION_TYPE_ICONS.get(obj.action_type, '❓')
+        display = obj.get_action_type_display()
+        return format_html('<span title="{}">{} {}</span>', display, icon, display)
     
     action_type_icon.short_description = 'Дія'
     
     def user_link(self, obj):
         if not obj.user:
             return "Анонім"
-        url = reverse('admin:auth_user_change', args=[obj.user.id])
+        url = _admin_change_url('auth', 'user', obj.user_id)
         return format_html('<a href="{}">{}</a>', url, obj.user.username)
     
     user_link.short_description = 'Користувач'
@@ -64,12 +110,11 @@ class ActionLogAdmin(admin.ModelAdmin):
     def object_link(self, obj):
         if not obj.content_object:
             return "-"
-        try:
-            url = reverse(f'admin:{obj.content_type.app_label}_{obj.content_type.model}_change', args=[obj.object_id])
-            obj_str = str(obj.content_object)[:40]
-            return format_html('<a href="{}" title="{}">{} ({})</a>', url, str(obj.content_object), obj_str, obj.content_type.model)
-        except:
+        url = _admin_change_url(obj.content_type.app_label, obj.content_type.model, obj.object_id)
+        if url is None:
             return f"{obj.content_type.model}: {obj.object_id}"
+        obj_str = str(obj.content_object)[:40]
+        return format_html('<a href="{}" title="{}">{} ({})</a>', url, str(obj.content_object), obj_str, obj.content_type.model)
     
     object_link.short_description = "Об'єкт"
     
@@ -91,33 +136,36 @@ class ActionLogAdmin(admin.ModelAdmin):
     def user_agent_display(self, obj):
         if not obj.user_agent:
             return "-"
-        ua = obj.user_agent.lower()
-        if 'chrome' in ua: browser = 'Chrome'
-        elif 'firefox' in ua: browser = 'Firefox'
-        elif 'safari' in ua: browser = 'Safari'
-        elif 'edge' in ua: browser = 'Edge'
-        elif 'opera' in ua: browser = 'Opera'
-        else: browser = 'Інший'
+        match = BROWSER_RE.search(obj.user_agent)
+        browser = match.group(1).title() if match else 'Інший'
         return format_html('<div title="{}"><strong>{}</strong><br><small>{}</small></div>', obj.user_agent, browser, obj.user_agent[:100] + '...' if len(obj.user_agent) > 100 else obj.user_agent)
     
     user_agent_display.short_description = 'Браузер'
     
     def export_as_json(self, request, queryset):
-        import json
-        from django.http import HttpResponse
-        data = []
-        for log in queryset:
-            data.append({
-                'id': str(log.id),
-                'action_type': log.action_type,
-                'timestamp': log.timestamp.isoformat(),
-                'user': log.user.username if log.user else None,
-                'object_type': log.content_type.model if log.content_type else None,
-                'object_id': log.object_id,
-                'description': log.description,
-                'ip_address': log.ip_address,
-            })
-        response = HttpResponse(json.dumps(data, indent=2, ensure_ascii=False), content_type='application/json')
+        rows = queryset.prefetch_related(None).values(
+            'id', 'action_type', 'timestamp', 'user__username', 'content_type__model',
+            'object_id', 'description', 'ip_address',
+        )
+        
+        def stream():
+            yield b'['
+            for index, row in enumerate(rows.iterator(chunk_size=2000)):
+                if index:
+                    yield b','
+                yield _dump_json({
+                    'id': str(row['id']),
+                    'action_type': row['action_type'],
+                    'timestamp': row['timestamp'].isoformat(),
+                    'user': row['user__username'],
+                    'object_type': row['content_type__model'],
+                    'object_id': row['object_id'],
+                    'description': row['description'],
+                    'ip_address': row['ip_address'],
+                })
+            yield b']'
+        
+        response = StreamingHttpResponse(stream(), content_type='application/json')
         response['Content-Disposition'] = 'attachment; filename="action_logs.json"'
         return response
     
@@ -133,43 +181,65 @@ class ActionLogAdmin(admin.ModelAdmin):
         return request.user.is_superuser
 
 
-@admin.register(Blog)
-class BlogAdmin(admin.ModelAdmin):
-    list_display = ['title', 'author', 'created_at', 'updated_at', 'is_published', 'action_logs_count']
-    list_filter = ['is_published', 'created_at', 'author']
-    search_fields = ['title', 'content', 'author__username']
-    readonly_fields = ['created_at', 'updated_at', 'action_logs_count_display']
-    fieldsets = (
-        ('Основна інформація', {'fields': ('title', 'content', 'author', 'tags')}),
-        ('Налаштування', {'fields': ('is_published',)}),
-        ('Метадані', {'fields': ('created_at', 'updated_at', 'action_logs_count_display'), 'classes': ('collapse',)}),
-    )
-    inlines = [ActionLogInline]
+class LoggedModelAdmin(admin.ModelAdmin):
+    
+    def get_queryset(self, request):
+        # A correlated count rather than Count('action_logs'): the generic
+        # relation joins the integer pk to the varchar object_id, which
+        # PostgreSQL refuses to compare without a cast. Integer pks match
+        # on object_id_int, the same column target_filter() and the link use.
+        if isinstance(self.model._meta.pk, IntegerField):
+            target = {'object_id_int': OuterRef('pk')}
+        else:
+            target = {'object_id': Cast(OuterRef('pk'), CharField())}
+        logs = ActionLog.objects.filter(
+            content_type=get_content_type(self.model), **target
+        ).order_by().values('content_type').annotate(count=Count('pk')).values('count')
+        return super().get_queryset(request).annotate(
+            _action_logs_count=Coalesce(Subquery(logs), 0)
+        )
     
     def action_logs_count(self, obj):
-        return obj.action_logs.count()
+        return obj._action_logs_count
     
     action_logs_count.short_description = 'Логи'
+    action_logs_count.admin_order_field = '_action_logs_count'
     
-    def action_logs_count_display(self, obj):
-        count = obj.action_logs.count()
+    def action_logs_link(self, obj):
+        count = obj._action_logs_count
         if count == 0:
             return "Немає логів"
-        content_type = ContentType.objects.get_for_model(Blog)
-        url = reverse('admin:action_logs_actionlog_changelist')
-        url += f'?content_type__id__exact={content_type.id}&object_id__exact={obj.id}'
+        content_type = get_content_type(type(obj))
+        url = _admin_url('action_logs_actionlog_changelist')
+        lookup = ActionLog.target_filter(content_type.id, obj.pk)
+        field = 'object_id_int' if 'object_id_int' in lookup else 'object_id'
+        url += '?' + urlencode({'content_type__id__exact': content_type.id, f'{field}__exact': lookup[field]})
         return format_html('<a href="{}">{} записів</a>', url, count)
     
-    action_logs_count_display.short_description = 'Історія дій'
+    action_logs_link.short_description = 'Історія дій'
+
+
+@admin.register(Blog)
+class BlogAdmin(LoggedModelAdmin):
+    list_display = ['title', 'author', 'created_at', 'updated_at', 'is_published', 'action_logs_count']
+    list_filter = ['is_published', 'created_at', 'author']
+    search_fields = ['title', 'content', 'author__username']
+    autocomplete_fields = ['author']
+    readonly_fields = ['created_at', 'updated_at', 'action_logs_link']
+    fieldsets = (
+        ('Основна інформація', {'fields': ('title', 'content', 'author', 'tags')}),
+        ('Налаштування', {'fields': ('is_published',)}),
+        ('Метадані', {'fields': ('created_at', 'updated_at', 'action_logs_link'), 'classes': ('collapse',)}),
+    )
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
-    list_display = ['preview', 'author', 'blog', 'created_at', 'is_active']
+class CommentAdmin(LoggedModelAdmin):
+    list_display = ['preview', 'author', 'blog', 'created_at', 'is_active', 'action_logs_count']
     list_filter = ['is_active', 'created_at', 'author']
     search_fields = ['text', 'author__username', 'blog__title']
-    readonly_fields = ['created_at', 'updated_at']
-    inlines = [ActionLogInline]
+    autocomplete_fields = ['author', 'blog']
+    readonly_fields = ['created_at', 'updated_at', 'action_logs_link']
     
     def preview(self, obj):
         return obj.text[:100] + '...' if len(obj.text) > 100 else obj.text
@@ -178,26 +248,23 @@ class CommentAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(LoggedModelAdmin):
     list_display = ['user', 'location', 'website', 'action_logs_count']
     search_fields = ['user__username', 'bio', 'location']
-    readonly_fields = ['social_links_display']
+    autocomplete_fields = ['user']
+    readonly_fields = ['social_links_display', 'action_logs_link']
     fieldsets = (
         ('Основна інформація', {'fields': ('user', 'bio', 'avatar')}),
+        ('Метадані', {'fields': ('action_logs_link',), 'classes': ('collapse',)}),
 )
-    inlines = [ActionLogInline]
     
     def social_links_display(self, obj):
         if not obj.social_links:
             return "Немає посилань"
-        html = []
-        for platform, url in obj.social_links.items():
-            html.append(f'<div><strong>{platform}:</strong> <a href="{url}" target="_blank">{url}</a></div>')
-        return format_html(''.join(html))
-    
-    social_links_display.short_description = 'Соціальні мережі'
-    
-    def action_logs_count(self, obj):
-        return obj.action_logs.count()
+        return format_html_join(
+            '',
+            '<div><strong>{}:</strong> <a href="{}" target="_blank">{}</a></div>',
+            ((platform, url, url) for platform, url in obj.social_links.items())
+        )
     
-    action_logs_count.short_description = 'Логи'
\ No newline at end of file
+    social_links_display.short_description = 'Соціальні мережі'
\ No newline at end of file
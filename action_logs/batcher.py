@@ -0,0 +1,112 @@
+# action_logs/batcher.py
+import threading
+import weakref
+from django.db import transaction
+from .models import ActionLog
+
+BATCH_SIZE = 500
+
+_local = threading.local()
+
+
+def start_request():
+    _local.in_request = True
+
+
+def in_request():
+    return getattr(_local, 'in_request', False)
+
+
+def pending():
+    if not hasattr(_local, 'logs'):
+        _local.logs = []
+    return _local.logs
+
+
+def enqueue(log):
+    pending().append(log)
+
+
+def drain():
+    logs = pending()
+    _local.logs = []
+    return logs
+
+
+def discard(content_type, object_id):
+    object_id = str(object_id)
+    
+    def keep(log):
+        return not (log.content_type_id == content_type.id and log.object_id == object_id)
+    
+    _local.logs = [log for log in pending() if keep(log)]
+    for batches in getattr(_local, 'commit_batches', {}).values():
+        for batch in list(batches.values()):
+            batch.logs = [log for log in batch.logs if keep(log)]
+
+
+def deduplicate(logs):
+    # Repeated saves of the same object produce identical rows; keep only
+    # the latest of each. Logs without a target (e.g. deletes) are kept.
+    latest = {}
+    for index, log in enumerate(logs):
+        if log.object_id is None:
+            key = index
+        else:
+            key = (log.user_id, log.action_type, log.content_type_id, log.object_id, log.description)
+        latest.pop(key, None)
+        latest[key] = log
+    return list(latest.values())
+
+
+def flush():
+    _local.in_request = False
+    logs = deduplicate(drain())
+    if logs:
+        ActionLog.objects.bulk_create(logs, batch_size=BATCH_SIZE)
+    return logs
+
+
+class CommitBatch:
+
+    def __init__(self):
+        self.logs = []
+        self.flushed = False
+
+    def flush(self):
+        self.flushed = True
+        # Inside a request the committed logs join the request queue, which
+        # is written after the response has been sent (request_finished).
+        if in_request():
+            pending().extend(self.logs)
+        else:
+            ActionLog.objects.bulk_create(deduplicate(self.logs), batch_size=BATCH_SIZE)
+
+
+def commit_batches(connection):
+    # Connections are thread-local, so one registry per thread and alias.
+    if not hasattr(_local, 'commit_batches'):
+        _local.commit_batches = {}
+    return _local.commit_batches.setdefault(connection.alias, weakref.WeakValueDictionary())
+
+
+def enqueue_on_commit(log):
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        if in_request():
+            enqueue(log)
+        else:
+            log.save(force_insert=True)
+        return
+
+    # A batch is only strongly referenced by its on_commit callback. When a
+    # (savepoint) transaction rolls back Django discards that callback, so
+    # the batch leaves the registry with it instead of collecting logs
+    # that will never be written.
+    batches = commit_batches(connection)
+    key = tuple(connection.savepoint_ids)
+    batch = batches.get(key)
+    if batch is None or batch.flushed:
+        batch = batches[key] = CommitBatch()
+        transaction.on_commit(batch.flush)
+    batch.logs.append(log)
@@ -2,13 +2,17 @@ import random
 from datetime import timedelta
 from django.utils import timezone
 from django.core.management.base import BaseCommand
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
-from django.contrib.contenttypes.models import ContentType
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count
 from action_logs.models import ActionLog, Blog, Comment, UserProfile
 
 
 class Command(BaseCommand):
     help = 'Створення тестових даних для ActionLog'
+    batch_size = 500
     
     def add_arguments(self, parser):
         parser.add_argument(
@@ -38,25 +42,40 @@ class Command(BaseCommand):
     
     def handle(self, *args, **options):
         self.stdout.write(self.style.SUCCESS('Початок створення тестових даних...'))
-
+        
+        with transaction.atomic():
+            self.create_data(options)
+        
+        self.print_statistics()
+    
+    def create_data(self, options):
         ActionLog.objects.all().delete()
         Comment.objects.all().delete()
         Blog.objects.all().delete()
         UserProfile.objects.all().delete()
         User.objects.exclude(is_superuser=True).delete()
         
-        users = []
-        for i in range(options['users']):
-            user = User.objects.create_user(
+        logs = []
+        log_timestamps = []
+        
+        def add_log(timestamp, **fields):
+            logs.append(ActionLog.build_log(**fields))
+            log_timestamps.append(timestamp)
+        
+        password = make_password('testpass123')
+        users = User.objects.bulk_create([
+            User(
                 username=f'test_user_{i+1}',
                 email=f'user{i+1}@example.com',
-                password='testpass123',
+                password=password,
                 first_name=f'Ім\'я_{i+1}',
                 last_name=f'Прізвище_{i+1}'
             )
-            users.append(user)
-            
-            profile = UserProfile.objects.create(
+            for i in range(options['users'])
+        ], batch_size=self.batch_size)
+        
+        profiles = UserProfile.objects.bulk_create([
+            UserProfile(
                 user=user,
                 bio=f'Біографія користувача {user.username}',
                 location=random.choice(['Київ', 'Львів', 'Одеса', 'Харків', 'Дніпро']),
@@ -67,34 +86,39 @@ class Command(BaseCommand):
                     'linkedin': f'https://linkedin.com/in/{user.username}'
                 }
             )
+            for user in users
+        ], batch_size=self.batch_size)
+        
+        now = timezone.now()
+        for user, profile in zip(users, profiles):
+            add_log(now, action_type='create', user=user, obj=user,
+                    description=f'Create користувача: {user.username}')
+            add_log(now, action_type='create', user=user, obj=profile,
+                    description=profile.get_create_log_description())
         
         self.stdout.write(self.style.SUCCESS(f'Створено {len(users)} користувачів'))
-
-        blogs = []
-        for i in range(options['blogs']):
-            days_ago = random.randint(0, 30)
-            created_at = timezone.now() - timedelta(days=days_ago)
-            
-            blog = Blog.objects.create (
+        
+        blogs = [
+            Blog(
                 title=f'Тестовий блог #{i+1}: {random.choice(["Про програмування", "Про подорожі", "Про кулінарію", "Про спорт"])}',
-                content={' '.join([f"Абзац {j+1}." for j in range(random.randint(3, 10))])},
+                content=' '.join([f"Абзац {j+1}." for j in range(random.randint(3, 10))]),
                 author=random.choice(users),
                 is_published=random.choice([True, False, True]),
                 tags=random.sample(['python', 'django', 'web', 'dev', 'travel', 'food', 'sport'], k=3)
             )
-            
-            Blog.objects.filter(id=blog.id).update(created_at=created_at)
-            blog.refresh_from_db()
-            blogs.append(blog)
+            for i in range(options['blogs'])
+        ]
+        blog_dates = [now - timedelta(days=random.randint(0, 30)) for _ in blogs]
+        self.bulk_create_backdated(Blog, blogs, 'created_at', blog_dates)
+        
+        for blog, created_at in zip(blogs, blog_dates):
+            add_log(created_at, action_type='create', user=blog.author, obj=blog,
+                    description=blog.get_create_log_description())
         
         self.stdout.write(self.style.SUCCESS(f'Створено {len(blogs)} блогів'))
-
-        comments = []
-        for i in range(options['comments']):
-            days_ago = random.randint(0, 15)
-            created_at = timezone.now() - timedelta(days=days_ago)
-            
-            comment = Comment.objects.create(
+        
+        comments = [
+            Comment(
                 blog=random.choice(blogs),
                 author=random.choice(users),
                 text=f'''
@@ -103,10 +127,14 @@ class Command(BaseCommand):
                 ''',
                 is_active=random.choice([True, False, True, True])
             )
-            
-            Comment.objects.filter(id=comment.id).update(created_at=created_at)
-            comment.refresh_from_db()
-            comments.append(comment)
+            for i in range(options['comments'])
+        ]
+        comment_dates = [now - timedelta(days=random.randint(0, 15)) for _ in comments]
+        self.bulk_create_backdated(Comment, comments, 'created_at', comment_dates)
+        
+        for comment, created_at in zip(comments, comment_dates):
+            add_log(created_at, action_type='create', user=comment.author, obj=comment,
+                    description=comment.get_create_log_description())
         
         self.stdout.write(self.style.SUCCESS(f'Створено {len(comments)} коментарів'))
         
@@ -123,43 +151,42 @@ class Command(BaseCommand):
             'Відправка повідомлення',
             'Зміна налаштувань'
         ]
+        user_agents = [
+            'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+            'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+            'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/537.36'
+        ]
         
-        all_objects = list(blogs) + list(comments) + list(users) + list(UserProfile.objects.all())
+        all_objects = blogs + comments + users + profiles
         
         for i in range(options['logs']):
-            content_obj = random.choice(all_objects) if all_objects else None
-            
-            log_user = random.choice(users + [None, None])
-
-            log = ActionLog.objects.create(
+            log_timestamp = now - timedelta(
+                days=random.randint(0, 60),
+                hours=random.randint(0, 23),
+                minutes=random.randint(0, 59)
+            )
+            add_log(
+                log_timestamp,
                 action_type=random.choice(action_types),
-                user=log_user,
-                content_object=content_obj,
+                user=random.choice(users + [None, None]),
+                obj=random.choice(all_objects) if all_objects else None,
                 description=random.choice(descriptions) + f" (лог #{i+1})",
                 ip_address=f'192.168.1.{random.randint(1, 255)}',
-                user_agent=random.choice([
-                    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
-                    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-                    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
-                    'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0 like Mac OS X) AppleWebKit/537.36'
-                ])
+                user_agent=random.choice(user_agents)
             )
-            
-            days_ago = random.randint(0, 60)
-            hours_ago = random.randint(0, 23)
-            minutes_ago = random.randint(0, 59)
-            
-            log_timestamp = timezone.now() - timedelta(
-                days=days_ago,
-                hours=hours_ago,
-                minutes=minutes_ago
-            )
-            
-            ActionLog.objects.filter(id=log.id).update(timestamp=log_timestamp)
         
-        self.stdout.write(self.style.SUCCESS(f'Створено {options["logs"]} додаткових логів'))
+        self.bulk_create_backdated(ActionLog, logs, 'timestamp', log_timestamps)
         
-        self.print_statistics()
+        self.stdout.write(self.style.SUCCESS(f'Створено {options["logs"]} додаткових логів'))
+    
+    def bulk_create_backdated(self, model, objs, field_name, values):
+        # auto_now_add overwrites the field on insert, so the dates are
+        # restored with one batched UPDATE afterwards.
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+        for obj, value in zip(objs, values):
+            setattr(obj, field_name, value)
+        model.objects.bulk_update(objs, [field_name], batch_size=self.batch_size)
     
     def print_statistics(self):
         self.stdout.write('\n' + '='*50)
@@ -181,8 +208,11 @@ class Command(BaseCommand):
         self.stdout.write('ЛОГИ ПО ТИПАХ ДІЙ:')
         self.stdout.write('-'*50)
         
+        action_type_counts = dict(
+            ActionLog.objects.order_by().values_list('action_type').annotate(count=Count('id'))
+        )
         for action_type, display_name in ActionLog.ACTION_TYPES:
-            count = ActionLog.objects.filter(action_type=action_type).count()
+            count = action_type_counts.get(action_type, 0)
             if count > 0:
                 self.stdout.write(f'{display_name}: {count}')
         
@@ -190,22 +220,25 @@ class Command(BaseCommand):
         self.stdout.write('ЛОГИ ПО ТИПАХ ОБ\'ЄКТІВ:')
         self.stdout.write('-'*50)
         
-        content_types = ContentType.objects.filter(
-            pk__in=ActionLog.objects.values_list('content_type', flat=True).distinct()
+        content_type_counts = (
+            ActionLog.objects.filter(content_type__isnull=False)
+            .order_by()
+            .values_list('content_type__app_label', 'content_type__model')
+            .annotate(count=Count('id'))
         )
         
-        for ct in content_types:
-            count = ActionLog.objects.filter(content_type=ct).count()
-            model_name = ct.model_class().__name__
-            self.stdout.write(f'{model_name}: {count}')
+        for app_label, model, count in content_type_counts:
+            model_class = apps.get_model(app_label, model)
+            self.stdout.write(f'{model_class.__name__}: {count}')
         
         self.stdout.write('\n' + '-'*50)
         self.stdout.write('ОСТАННІ 5 ЛОГІВ:')
         self.stdout.write('-'*50)
         
-        for log in ActionLog.objects.all().order_by('-timestamp')[:5]:
+        recent_logs = ActionLog.objects.select_related('user')
+        for log in recent_logs.order_by('-timestamp')[:5]:
             user_str = log.user.username if log.user else 'Анонім'
-            obj_str = str(log.content_object)[:30] if log.content_object else 'Немає'
+            obj_str = log.object_repr[:30] or 'Немає'
             
             self.stdout.write(
                 f'{log.timestamp.strftime("%d.%m.%Y %H:%M")} | '
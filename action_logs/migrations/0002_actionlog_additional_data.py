@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-15 05:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action_logs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actionlog',
+            name='additional_data',
+            field=models.JSONField(blank=True, default=dict, verbose_name='Додаткові дані'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action_logs', '0002_actionlog_additional_data'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='actionlog',
+            name='action_logs_action__de729f_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='actionlog',
+            name='action_logs_user_id_1dbdd3_idx',
+        ),
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['action_type', '-timestamp'], name='action_logs_action__fd08b2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['user', '-timestamp'], name='action_logs_user_id_0b3acf_idx'),
+        ),
+    ]
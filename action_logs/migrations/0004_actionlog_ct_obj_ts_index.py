@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action_logs', '0003_actionlog_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='actionlog',
+            name='action_logs_content_039c98_idx',
+        ),
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['content_type', 'object_id', '-timestamp'], name='al_ct_obj_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:06
+
+import re
+
+from django.db import migrations, models
+from django.db.models.functions import Cast
+
+
+# Frozen copy of action_logs.models.integer_object_id, so the backfill
+# keeps its meaning if the model helper changes.
+INTEGER_ID_RE = re.compile(r'0|-?[1-9][0-9]*')
+
+
+def integer_object_id(object_id):
+    object_id = str(object_id)
+    if not INTEGER_ID_RE.fullmatch(object_id):
+        return None
+    value = int(object_id)
+    if -models.BigIntegerField.MAX_BIGINT - 1 <= value <= models.BigIntegerField.MAX_BIGINT:
+        return value
+    return None
+
+
+def backfill_object_id_int(apps, schema_editor):
+    ActionLog = apps.get_model('action_logs', 'ActionLog')
+    # Up to 18 digits always fits a bigint and is cast in the database;
+    # 19-digit ids need the range check of integer_object_id().
+    ActionLog.objects.filter(object_id__regex=r'^(0|-?[1-9][0-9]{0,17})$').update(
+        object_id_int=Cast('object_id', models.BigIntegerField())
+    )
+    long_ids = ActionLog.objects.filter(object_id__regex=r'^-?[1-9][0-9]{18}$')
+    for pk, object_id in long_ids.values_list('pk', 'object_id').iterator():
+        ActionLog.objects.filter(pk=pk).update(object_id_int=integer_object_id(object_id))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action_logs', '0004_actionlog_ct_obj_ts_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actionlog',
+            name='object_id_int',
+            field=models.BigIntegerField(blank=True, editable=False, null=True, verbose_name="Числовий ID об'єкта"),
+        ),
+        migrations.RunPython(backfill_object_id_int, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['content_type', 'object_id_int', '-timestamp'], name='al_ct_objint_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:08
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action_logs', '0005_actionlog_object_id_int'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='actionlog',
+            name='action_logs_ip_addr_4dfdc7_idx',
+        ),
+    ]
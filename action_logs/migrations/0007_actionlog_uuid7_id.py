@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:09
+
+import action_logs.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action_logs', '0006_remove_actionlog_ip_address_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='actionlog',
+            name='id',
+            field=models.UUIDField(default=action_logs.models.uuid7, editable=False, primary_key=True, serialize=False, verbose_name='Ідентифікатор'),
+        ),
+    ]
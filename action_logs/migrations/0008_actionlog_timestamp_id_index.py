@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action_logs', '0007_actionlog_uuid7_id'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='actionlog',
+            name='action_logs_timesta_69b004_idx',
+        ),
+        migrations.AddIndex(
+            model_name='actionlog',
+            index=models.Index(fields=['-timestamp', '-id'], name='action_logs_timesta_7f34ef_idx'),
+        ),
+    ]
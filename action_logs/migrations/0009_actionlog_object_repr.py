@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-15 06:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('action_logs', '0008_actionlog_timestamp_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='actionlog',
+            name='object_repr',
+            field=models.CharField(blank=True, max_length=200, verbose_name="Представлення об'єкта"),
+        ),
+    ]
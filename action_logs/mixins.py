@@ -1,17 +1,30 @@
 from django.shortcuts import get_object_or_404
-from django.http import HttpResponseForbidden
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404, HttpResponseForbidden
 from django.contrib.auth.mixins import UserPassesTestMixin
 from django.core.cache import cache
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+import hashlib
 import json
 from django.http import JsonResponse
 from django.db.models import Q
 from django.utils import timezone
 from datetime import timedelta
+from urllib.parse import urlencode
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 import logging
 
 logger = logging.getLogger(__name__)
 
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+def get_client_ip(request):
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0]
+    return request.META.get('REMOTE_ADDR')
+
 class OwnerRequiredMixin:
     owner_field = 'author'
     permission_denies_message = 'You do not have rights for this action'
@@ -23,6 +36,13 @@ class OwnerRequiredMixin:
         
         return super().dispatch(request, *args, **kwargs)
     
+    def get_object(self, queryset=None):
+        # get()/post() of the edit views fetch the object again after the
+        # ownership check in dispatch(); hand them the one already loaded.
+        if queryset is None and getattr(self, 'object', None) is not None:
+            return self.object
+        return super().get_object(queryset)
+    
 
 class AutoAuthorMixin:
     author_field = 'author'
@@ -42,26 +62,29 @@ class QueryFilterMixin:
     
     def get_queryset(self):
         queryset = super().get_queryset()
+        filters = {}
+        search_q = Q()
         
         for field in self.filter_fields:
             value = self.request.GET.get(field)
             if value:
-                queryset = queryset.filter(**{field: value})
+                filters[field] = value
         
         search_query = self.request.GET.get('search')
         if search_query and self.search_fields:
-            q_objects = Q()
             for field in self.search_fields:
-                q_objects |= Q(**{f'{field}__icontains': search_query})
-            queryset = queryset.filter(q_objects)
+                search_q |= Q(**{f'{field}__icontains': search_query})
         
         if self.date_range_field:
             start_date = self.request.GET.get('start_date')
             end_date = self.request.GET.get('end_date')
             if start_date:
-                queryset = queryset.filter(**{f'{self.date_range_field}__gte': start_date})
+                filters[f'{self.date_range_field}__gte'] = start_date
             if end_date:
-                queryset = queryset.filter(**{f'{self.date_range_field}__lte': end_date})
+                filters[f'{self.date_range_field}__lte'] = end_date
+        
+        if filters or search_q:
+            queryset = queryset.filter(search_q, **filters)
         
         return queryset
     
@@ -116,13 +139,19 @@ class CacheViewMixin:
     vary_on_user = False
     
     def get_cache_key(self):
+        cache_key = getattr(self.request, '_view_cache_key', None)
+        if cache_key is None:
+            cache_key = self.request._view_cache_key = self.build_cache_key()
+        return cache_key
+    
+    def build_cache_key(self):
         base_key = f"{self.cache_key_prefix}:{self.request.path}"
         if self.vary_on_user and self.request.user.is_authenticated:
             base_key += f":user_{self.request.user.id}"
         
-        query_params = self.request.GET.urlencode()
+        query_params = urlencode(sorted(self.request.GET.lists()), doseq=True)
         if query_params:
-            base_key += f":{hash(query_params)}"
+            base_key += f":{hashlib.blake2b(query_params.encode(), digest_size=8).hexdigest()}"
         
         return base_key
     
@@ -150,43 +179,56 @@ class ActionLoggingMixin:
     def dispatch(self, request, *args, **kwargs):
         response = super().dispatch(request, *args, **kwargs)
         
-        if self.log_action and request.user.is_authenticated:
+        if self.log_action and request.user.is_authenticated and self.should_log(request, response):
             self.log_user_action(request, response, *args, **kwargs)
         
         return response
     
+    def should_log(self, request, response):
+        # A GET only ever views something; other actions are logged for
+        # the successful unsafe request that performs them.
+        if response.status_code >= 400:
+            return False
+        if request.method in SAFE_METHODS:
+            return self.action_type == 'view'
+        return True
+    
     def log_user_action(self, request, response, *args, **kwargs):
+        from . import batcher
         from .models import ActionLog
         
         try:
-            obj = None
-            if hasattr(self, 'object'):
-                obj = self.object
-            elif hasattr(self, 'get_object'):
+            obj = getattr(self, 'object', None)
+            if obj is None and self.has_object_lookup():
                 try:
                     obj = self.get_object()
-                except:
+                except (ObjectDoesNotExist, Http404):
                     pass
             
-            ActionLog.objects.create(
+            log = ActionLog(
                 user=request.user,
                 action_type=self.action_type,
                 ip_address=self.get_client_ip(request),
                 user_agent=request.META.get('HTTP_USER_AGENT', ''),
-                object_id=obj.id if obj else None,
-                content_type=obj.__class__ if obj else None,
                 additional_data=self.get_log_data(request, response, *args, **kwargs)
             )
+            if obj:
+                log.set_target(obj)
+            if batcher.in_request():
+                batcher.enqueue(log)
+            else:
+                log.save(force_insert=True)
         except Exception as e:
             logger.error(f"Failed to log action: {e}")
     
+    def has_object_lookup(self):
+        if not hasattr(self, 'get_object'):
+            return False
+        lookup_kwargs = (getattr(self, 'pk_url_kwarg', 'pk'), getattr(self, 'slug_url_kwarg', 'slug'))
+        return any(kwarg in self.kwargs for kwarg in lookup_kwargs)
+    
     def get_client_ip(self, request):
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        return get_client_ip(request)
     
     def get_log_data(self, request, response, *args, **kwargs):
         return {
@@ -211,7 +253,7 @@ class PublicPrivateMixin:
         else:
             queryset = queryset.filter(
                 Q(**{self.public_field: True}) | 
-                Q(**{self.get_owner_lookup()})
+                Q(**self.get_owner_lookup())
             )
         
         return queryset
@@ -258,12 +300,79 @@ class EnhancedPaginationMixin:
         return context
 
 
+class KeysetPaginationMixin:
+    cursor_kwarg = 'after'
+    cursor_fields = ('timestamp', 'id')
+    
+    def get_queryset(self):
+        return super().get_queryset().order_by(*(f'-{field}' for field in self.cursor_fields))
+    
+    def get_cursor(self):
+        value = self.request.GET.get(self.cursor_kwarg)
+        if not value:
+            return None
+        
+        try:
+            parts = urlsafe_base64_decode(value).decode().rsplit(',', len(self.cursor_fields) - 1)
+            if len(parts) != len(self.cursor_fields):
+                raise ValueError
+            return [
+                self.model._meta.get_field(field).to_python(part)
+                for field, part in zip(self.cursor_fields, parts)
+            ]
+        except (ValueError, ValidationError):
+            raise Http404('Invalid cursor.')
+    
+    def make_cursor(self, obj):
+        # Base64 so the token survives being put in a URL unescaped (a
+        # raw isoformat '+00:00' would decode to a space).
+        values = (getattr(obj, field) for field in self.cursor_fields)
+        raw = ','.join(
+            value.isoformat() if hasattr(value, 'isoformat') else str(value)
+            for value in values
+        )
+        return urlsafe_base64_encode(raw.encode())
+    
+    def filter_after(self, queryset, cursor):
+        # Rows after the cursor in (a, b, c) descending order:
+        # a < x OR (a = x AND b < y) OR (a = x AND b = y AND c < z).
+        condition = Q()
+        for i, (field, value) in enumerate(zip(self.cursor_fields, cursor)):
+            equal = dict(zip(self.cursor_fields[:i], cursor[:i]))
+            condition |= Q(**equal, **{f'{field}__lt': value})
+        return queryset.filter(condition)
+    
+    def paginate_queryset(self, queryset, page_size):
+        page_size = max(page_size, 1)
+        cursor = self.get_cursor()
+        if cursor is None:
+            paginator, page, object_list, is_paginated = super().paginate_queryset(queryset, page_size)
+            object_list = page.object_list = list(page.object_list)
+            has_next = page.has_next()
+        else:
+            # Seek past the cursor instead of OFFSET, so deep pages cost
+            # one index lookup rather than skipping every earlier row.
+            rows = list(self.filter_after(queryset, cursor)[:page_size + 1])
+            paginator, page, object_list, is_paginated = None, None, rows[:page_size], True
+            has_next = len(rows) > page_size
+        
+        self.next_cursor = self.make_cursor(object_list[-1]) if has_next else None
+        return paginator, page, object_list, is_paginated
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['next_cursor'] = getattr(self, 'next_cursor', None)
+        return context
+
+
 class RelatedObjectsMixin:
     related_objects = {}
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        obj = self.get_object() if hasattr(self, 'get_object') else None
+        obj = getattr(self, 'object', None)
+        if obj is None and hasattr(self, 'get_object'):
+            obj = self.object = self.get_object()
         
         if obj:
             for name, relation in self.related_objects.items():
@@ -284,16 +393,21 @@ class ObjectLogsMixin:
         
         if self.include_logs and hasattr(self, 'get_object'):
             try:
-                obj = self.get_object()
+                obj = getattr(self, 'object', None)
+                if obj is None:
+                    obj = self.object = self.get_object()
                 if obj and hasattr(obj, 'id'):
-                    from django.contrib.contenttypes.models import ContentType
-                    from .models import ActionLog
+                    from .models import ActionLog, get_content_type
                     
-                    content_type = ContentType.objects.get_for_model(obj)
-                    context['object_logs'] = ActionLog.objects.filter(
-                        content_type=content_type,
-                        object_id=obj.id
-                    ).select_related('user')[:self.logs_limit]
+                    content_type = get_content_type(type(obj))
+                    logs = list(ActionLog.objects.filter(
+                        **ActionLog.target_filter(content_type, obj.id)
+                    ).select_related('user')[:self.logs_limit])
+                    # Every log here points at obj, so attach it instead of
+                    # letting each log resolve its generic target again.
+                    for log in logs:
+                        log.content_object = obj
+                    context['object_logs'] = logs
             except:
                 context['object_logs'] = []
         
@@ -1,10 +1,59 @@
+import os
+import re
+import time
 import uuid
-from django.db import models
+from django.db import connections, models, router, transaction
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 
 
+def uuid7():
+    # RFC 9562 UUIDv7: 48-bit Unix millisecond prefix, so new keys land on
+    # the rightmost index page instead of random ones.
+    unix_ts_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    rand_a = rand >> 68
+    rand_b = rand & ((1 << 62) - 1)
+    return uuid.UUID(int=(
+        (unix_ts_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | rand_a << 64
+        | 0b10 << 62
+        | rand_b
+    ))
+
+
+_INTEGER_ID_RE = re.compile(r'0|-?[1-9][0-9]*')
+
+
+def integer_object_id(object_id):
+    # Only canonical ASCII integers that fit a bigint; anything else ('007',
+    # '²', 20-digit ids) stays on the varchar object_id.
+    object_id = str(object_id)
+    if not _INTEGER_ID_RE.fullmatch(object_id):
+        return None
+    value = int(object_id)
+    if -models.BigIntegerField.MAX_BIGINT - 1 <= value <= models.BigIntegerField.MAX_BIGINT:
+        return value
+    return None
+
+
+_content_types = {}
+
+
+def get_content_type(model):
+    try:
+        return _content_types[model]
+    except KeyError:
+        content_type = _content_types[model] = ContentType.objects.get_for_model(model)
+        return content_type
+
+
+def clear_content_type_cache():
+    _content_types.clear()
+
+
 class ActionLog(models.Model):
 
     ACTION_TYPES = [
@@ -22,7 +71,7 @@ class ActionLog(models.Model):
 
     id = models.UUIDField(
         primary_key=True,
-        default=uuid.uuid4,
+        default=uuid7,
         editable=False,
         verbose_name='Ідентифікатор'
     )
@@ -63,11 +112,24 @@ class ActionLog(models.Model):
         verbose_name='ID об\'єкта'
     )
     
+    object_id_int = models.BigIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        verbose_name='Числовий ID об\'єкта'
+    )
+    
     content_object = GenericForeignKey(
         'content_type',
         'object_id'
     )
     
+    object_repr = models.CharField(
+        max_length=200,
+        blank=True,
+        verbose_name='Представлення об\'єкта'
+    )
+    
     description = models.TextField(
         blank=True,
         verbose_name='Опис'
@@ -84,28 +146,43 @@ class ActionLog(models.Model):
         verbose_name='User Agent'
     )
     
+    additional_data = models.JSONField(
+        default=dict,
+        blank=True,
+        verbose_name='Додаткові дані'
+    )
+    
     class Meta:
         verbose_name = 'Лог дії'
         verbose_name_plural = 'Логи дій'
         ordering = ['-timestamp']
 
         indexes = [
-            models.Index(fields=['-timestamp']),
-            models.Index(fields=['action_type']),
-            models.Index(fields=['user']),
-            models.Index(fields=['content_type', 'object_id']),
-            models.Index(fields=['ip_address']),
+            models.Index(fields=['-timestamp', '-id']),
+            models.Index(fields=['action_type', '-timestamp']),
+            models.Index(fields=['user', '-timestamp']),
+            models.Index(fields=['content_type', 'object_id', '-timestamp'], name='al_ct_obj_ts_idx'),
+            models.Index(fields=['content_type', 'object_id_int', '-timestamp'], name='al_ct_objint_ts_idx'),
         ]
     
     def __str__(self):
         user_str = self.user.username if self.user else 'Анонім'
-        action = self.get_action_type_display()
+        action = _ACTION_TYPE_DISPLAY.get(self.action_type, self.action_type)
         
-        if self.content_object:
+        if self.object_repr:
+            return f"{action} | {user_str} | {self.object_repr[:50]}"
+        if self.object_id and self.content_object:
             obj_str = str(self.content_object)[:50]
             return f"{action} | {user_str} | {obj_str}"
         return f"{action} | {user_str} | {self.timestamp}"
     
+    def save(self, *args, **kwargs):
+        if self.object_id_int is None and self.object_id is not None:
+            self.object_id_int = integer_object_id(self.object_id)
+        if not self.object_repr and ActionLog.content_object.is_cached(self) and self.content_object is not None:
+            self.object_repr = str(self.content_object)[:200]
+        super().save(*args, **kwargs)
+    
     def get_absolute_url(self):
         from django.urls import reverse
         return reverse('action_log_detail', args=[str(self.id)])
@@ -119,8 +196,21 @@ class ActionLog(models.Model):
     @classmethod
     def log_action(cls, user, action_type, obj=None, description='', 
                    ip_address=None, user_agent=''):
-
-        log = cls.objects.create(
+        log = cls.build_log(
+            user=user,
+            action_type=action_type,
+            obj=obj,
+            description=description,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        log.save(force_insert=True)
+        return log
+    
+    @classmethod
+    def build_log(cls, user, action_type, obj=None, description='',
+                  ip_address=None, user_agent=''):
+        log = cls(
             user=user,
             action_type=action_type,
             description=description,
@@ -128,11 +218,33 @@ class ActionLog(models.Model):
             user_agent=user_agent
         )
         
-        if obj:
-            log.content_object = obj
-            log.save()
+        if obj is not None:
+            log.set_target(obj)
         
         return log
+    
+    def set_target(self, obj):
+        self.content_type = get_content_type(type(obj))
+        self.object_id = str(obj.pk)
+        self.object_id_int = integer_object_id(self.object_id)
+        self.object_repr = str(obj)[:200]
+    
+    @staticmethod
+    def target_filter(content_type, object_id):
+        # Integer targets go through the 8-byte object_id_int index instead
+        # of the varchar object_id one.
+        object_id_int = integer_object_id(object_id)
+        if object_id_int is None:
+            return {'content_type': content_type, 'object_id': str(object_id)}
+        return {'content_type': content_type, 'object_id_int': object_id_int}
+    
+    @classmethod
+    def bulk_log(cls, entries, batch_size=1000):
+        logs = [cls.build_log(**entry) for entry in entries]
+        return cls.objects.bulk_create(logs, batch_size=batch_size)
+
+
+_ACTION_TYPE_DISPLAY = dict(ActionLog.ACTION_TYPES)
 
 
 class LoggedModel(models.Model):
@@ -143,14 +255,50 @@ class LoggedModel(models.Model):
         related_query_name='%(app_label)s_%(class)s'
     )
     
+    log_user_field = None
+    
     class Meta:
         abstract = True
     
+    @classmethod
+    def bulk_create_with_logs(cls, objs, batch_size=1000):
+        connection = connections[router.db_for_write(cls)]
+        with transaction.atomic(using=connection.alias):
+            if connection.features.can_return_rows_from_bulk_insert:
+                objs = cls.objects.bulk_create(objs, batch_size=batch_size)
+            else:
+                # Without RETURNING bulk_create leaves pk unset, and the logs
+                # need it. save_base() skips the logging in the subclass save().
+                objs = list(objs)
+                for obj in objs:
+                    obj.save_base(force_insert=True, using=connection.alias)
+            ActionLog.bulk_log((
+                {
+                    'user': obj.get_log_user(),
+                    'action_type': 'create',
+                    'obj': obj,
+                    'description': obj.get_create_log_description(),
+                }
+                for obj in objs
+            ), batch_size=batch_size)
+        return objs
+    
+    def get_log_user(self):
+        if self.log_user_field is None:
+            return None
+        return getattr(self, self.log_user_field)
+    
+    def get_create_log_description(self):
+        return ''
+    
     def get_action_logs(self):
         return self.action_logs.all()
     
     def get_recent_logs(self, limit=10):
-        return self.action_logs.all()[:limit]
+        return self.action_logs.order_by('-timestamp').only(
+            'id', 'action_type', 'timestamp', 'user', 'description',
+            'content_type', 'object_id', 'object_repr'
+        ).select_related('user')[:limit]
     
     def log_action(self, user, action_type, description='', 
                    ip_address=None, user_agent=''):
@@ -162,9 +310,19 @@ class LoggedModel(models.Model):
             ip_address=ip_address,
             user_agent=user_agent
         )
+    
+    def log_action_on_commit(self, user, action_type, description=''):
+        from . import batcher
+        batcher.enqueue_on_commit(ActionLog.build_log(
+            user=user,
+            action_type=action_type,
+            obj=self,
+            description=description
+        ))
 
 
 class Blog(LoggedModel):
+    log_user_field = 'author'
 
     title = models.CharField(
         max_length=200,
@@ -211,6 +369,9 @@ class Blog(LoggedModel):
     def __str__(self):
         return self.title
     
+    def get_create_log_description(self):
+        return f'Створено блог: {self.title}'
+    
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         
@@ -220,25 +381,19 @@ class Blog(LoggedModel):
             self.log_action(
                 user=self.author,
                 action_type='create',
-                description=f'Створено блог: {self.title}'
+                description=self.get_create_log_description()
             )
         else:
-            self.log_action(
+            self.log_action_on_commit(
                 user=self.author,
                 action_type='update',
                 description=f'Оновлено блог: {self.title}'
             )
-    
-    def delete(self, *args, **kwargs):
-        self.log_action(
-            user=self.author,
-            action_type='delete',
-            description=f'Видалено блог: {self.title}'
-        )
-        super().delete(*args, **kwargs)
 
 
 class Comment(LoggedModel):
+    log_user_field = 'author'
+    
     blog = models.ForeignKey(
         Blog,
         on_delete=models.CASCADE,
@@ -280,6 +435,9 @@ class Comment(LoggedModel):
     def __str__(self):
         return f'Коментар від {self.author} до "{self.blog.title}"'
     
+    def get_create_log_description(self):
+        return f'Додано коментар до блогу: {self.blog.title}'
+    
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         super().save(*args, **kwargs)
@@ -288,7 +446,7 @@ class Comment(LoggedModel):
             self.log_action(
                 user=self.author,
                 action_type='create',
-                description=f'Додано коментар до блогу: {self.blog.title}'
+                description=self.get_create_log_description()
             )
     
     @property
@@ -297,6 +455,8 @@ class Comment(LoggedModel):
 
 
 class UserProfile(LoggedModel):
+    log_user_field = 'user'
+    
     user = models.OneToOneField(
         User,
         on_delete=models.CASCADE,
@@ -346,6 +506,9 @@ class UserProfile(LoggedModel):
     def __str__(self):
         return f'Профіль {self.user.username}'
     
+    def get_create_log_description(self):
+        return f'Створено профіль для {self.user.username}'
+    
     def save(self, *args, **kwargs):
         is_new = self.pk is None
         super().save(*args, **kwargs)
@@ -354,10 +517,10 @@ class UserProfile(LoggedModel):
             self.log_action(
                 user=self.user,
                 action_type='create',
-                description=f'Створено профіль для {self.user.username}'
+                description=self.get_create_log_description()
             )
         else:
-            self.log_action(
+            self.log_action_on_commit(
                 user=self.user,
                 action_type='update',
                 description=f'Оновлено профіль {self.user.username}'
@@ -1,68 +1,108 @@
 # action_logs/signals.py
-from django.db.models.signals import post_save, post_delete, pre_save
+from django.core.signals import request_finished, request_started
+from django.db.models.signals import post_migrate, post_save, post_delete, pre_save
+from django.db import close_old_connections, connections
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from django.contrib.contenttypes.models import ContentType
+from django.contrib.auth.signals import user_logged_in, user_logged_out
 from django.utils import timezone
-from .models import ActionLog, Blog, Comment, UserProfile
+from .models import ActionLog, Blog, Comment, UserProfile, clear_content_type_cache, get_content_type
+from . import batcher
+from .mixins import get_client_ip
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+@receiver(request_started)
+def start_action_log_request(sender, **kwargs):
+    batcher.start_request()
+
+
+@receiver(request_finished)
+def flush_action_logs(sender, **kwargs):
+    try:
+        batcher.flush()
+    except Exception as e:
+        logger.error(f"Failed to flush action logs: {e}")
+    finally:
+        # Django's close_old_connections receiver runs first, so the flush
+        # may have opened a fresh connection; don't leave it idle until the
+        # next request. Connections inside an atomic block (tests) are kept.
+        if not any(conn.in_atomic_block for conn in connections.all(initialized_only=True)):
+            close_old_connections()
+
+
+@receiver(post_migrate)
+def reset_content_type_cache(sender, **kwargs):
+    # Mirrors Django's own ContentType cache, which is only invalidated
+    # when migrations (re)create content types.
+    clear_content_type_cache()
+
+
 @receiver(post_save, sender=User)
-def log_user_save(sender, instance, created, **kwargs):
-    action_type = 'create' if created else 'update'
-    ip_address = None
-    user_agent = ''
+def log_user_save(sender, instance, created, update_fields=None, **kwargs):
+    # Every login bumps last_login; that is logged by log_user_login.
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
     
-    try:
-        from django.http import HttpRequest
-        request = HttpRequest()
-    except:
-        pass
+    action_type = 'create' if created else 'update'
     
-    ActionLog.objects.create(
+    batcher.enqueue_on_commit(ActionLog.build_log(
         action_type=action_type,
         user=instance,
-        content_object=instance,
-        description=f'{action_type.capitalize()} користувача: {instance.username}',
-        ip_address=ip_address,
-        user_agent=user_agent
-    )
+        obj=instance,
+        description=f'{action_type.capitalize()} користувача: {instance.username}'
+    ))
     
     logger.info(f"Записано лог для користувача {instance.username}: {action_type}")
 
 
-@receiver(post_save, sender=UserProfile)
-def log_profile_save(sender, instance, created, **kwargs):
-    action_type = 'create' if created else 'update'
+def log_auth_event(request, user, action_type, description):
+    ip_address = None
+    user_agent = ''
+    if request is not None:
+        ip_address = get_client_ip(request)
+        user_agent = request.META.get('HTTP_USER_AGENT', '')
     
-    ActionLog.objects.create(
+    batcher.enqueue_on_commit(ActionLog.build_log(
         action_type=action_type,
-        user=instance.user,
-        content_object=instance,
-        description=f'{action_type.capitalize()} профілю {instance.user.username}'
-    )
+        user=user,
+        obj=user,
+        description=description,
+        ip_address=ip_address,
+        user_agent=user_agent
+    ))
 
-@receiver(post_save, sender=Blog)
-def log_blog_save(sender, instance, created, **kwargs):
-    if created:
+
+@receiver(user_logged_in)
+def log_user_login(sender, request, user, **kwargs):
+    log_auth_event(request, user, 'login', f'Вхід користувача: {user.username}')
+
+
+@receiver(user_logged_out)
+def log_user_logout(sender, request, user, **kwargs):
+    if user is None:
         return
-    
-    instance.log_action(
-        user=instance.author,
-        action_type='update',
-        description=f'Оновлено блог: {instance.title}'
-    )
+    log_auth_event(request, user, 'logout', f'Вихід користувача: {user.username}')
 
 
 @receiver(post_delete, sender=Blog)
 def log_blog_delete(sender, instance, **kwargs):
-    ActionLog.objects.create(
+    batcher.enqueue_on_commit(ActionLog.build_log(
         action_type='delete',
         user=instance.author,
         description=f'Видалено блог: {instance.title}',
-        )
+    ))
+
+
+@receiver(post_delete, sender=Blog)
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=UserProfile)
+def discard_deleted_target_logs(sender, instance, **kwargs):
+    # The GenericRelation cascade has already removed the stored logs of
+    # instance; queued ones would be inserted after it and left orphaned.
+    batcher.discard(get_content_type(sender), instance.pk)
 
 
 @receiver(post_save, sender=Comment)
@@ -71,48 +111,42 @@ def log_comment_save(sender, instance, created, **kwargs):
     if created:
         return
     
-    instance.log_action(
+    batcher.enqueue_on_commit(ActionLog.build_log(
         user=instance.author,
         action_type='update',
+        obj=instance,
         description=f'Оновлено коментар до "{instance.blog.title}"'
-    )
+    ))
 
 
 @receiver(post_delete, sender=Comment)
 def log_comment_delete(sender, instance, **kwargs):
-    ActionLog.objects.create(
+    batcher.enqueue_on_commit(ActionLog.build_log(
         action_type='delete',
         user=instance.author,
         description=f'Видалено коментар до "{instance.blog.title}"'
-    )
+    ))
 
 
-@receiver(post_save)
-def universal_log_save(sender, instance, created, **kwargs):
-    ignored_models = [ActionLog, ContentType]
-    
-    if sender in ignored_models:
-        return
-    if hasattr(instance, 'action_logs'):
-        return
+OWNER_FIELDS = ('author', 'user', 'created_by')
+
 
 def register_model_signals(model_class):
+    field_names = {field.name for field in model_class._meta.get_fields()}
+    owner_attr = getattr(model_class, 'log_user_field', None) or next(
+        (name for name in OWNER_FIELDS if name in field_names), None
+    )
 
-    @receiver(post_save, sender=model_class)
+    @receiver(post_save, sender=model_class, weak=False,
+              dispatch_uid=f'log_model_save_{model_class._meta.label}')
     def log_model_save(sender, instance, created, **kwargs):
         action_type = 'create' if created else 'update'
         
-        user = None
-        if hasattr(instance, 'author'):
-            user = instance.author
-        elif hasattr(instance, 'user'):
-            user = instance.user
-        elif hasattr(instance, 'created_by'):
-            user = instance.created_by
+        user = getattr(instance, owner_attr) if owner_attr else None
         
-        ActionLog.objects.create(
+        batcher.enqueue_on_commit(ActionLog.build_log(
             action_type=action_type,
             user=user,
-            content_object=instance,
+            obj=instance,
             description=f'{action_type.capitalize()} {model_class.__name__}: {str(instance)[:100]}'
-        )
\ No newline at end of file
+        ))
\ No newline at end of file
@@ -1,9 +1,27 @@
 # action_logs/tests.py
-from django.test import TestCase, RequestFactory
+import json
+from importlib import import_module
+from io import StringIO
+import time
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, TransactionTestCase, RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.core.signals import request_finished, request_started
+from django.db import DatabaseError, connection, transaction
+from django.db.models.signals import post_save
 from django.contrib.auth.models import User
 from django.contrib.contenttypes.models import ContentType
+from django.http import Http404
 from django.utils import timezone
+from django.utils.http import urlsafe_base64_encode
+from django.views.generic import CreateView, DetailView
 from .models import ActionLog, Blog, Comment, UserProfile
+from .mixins import ActionLoggingMixin
+from .signals import register_model_signals
+from . import batcher
+from .admin import FasterAdminPaginator
+from .views import ActionLogListView, ObjectLogListView, BlogListView, BlogDeleteView, DashboardView
 
 
 class ActionLogModelTest(TestCase):
@@ -60,6 +78,13 @@ class ActionLogModelTest(TestCase):
         self.assertIn('testuser', str_representation)
         self.assertIn('Test Blog', str_representation)
     
+    def test_action_log_str_uses_object_repr(self):
+        log = ActionLog.log_action(user=self.user, action_type='view', obj=self.blog)
+        log = ActionLog.objects.select_related('user').get(pk=log.pk)
+        
+        with self.assertNumQueries(0):
+            self.assertIn('Test Blog', str(log))
+    
     def test_log_action_method(self):
         log = ActionLog.log_action(
             user=self.user,
@@ -73,6 +98,62 @@ class ActionLogModelTest(TestCase):
         self.assertEqual(log.description, 'User viewed blog')
         self.assertEqual(log.ip_address, '127.0.0.1')
     
+    def test_log_action_single_insert(self):
+        ContentType.objects.get_for_model(Blog)
+        
+        with self.assertNumQueries(1):
+            log = ActionLog.log_action(user=self.user, action_type='view', obj=self.blog)
+        
+        log.refresh_from_db()
+        self.assertEqual(log.content_object, self.blog)
+    
+    def test_uuid7_primary_key(self):
+        first = ActionLog.log_action(user=self.user, action_type='view')
+        time.sleep(0.002)
+        second = ActionLog.log_action(user=self.user, action_type='view')
+        
+        self.assertEqual(first.id.version, 7)
+        self.assertLess(first.id, second.id)
+    
+    def test_integer_target_id(self):
+        built = ActionLog.log_action(user=self.user, action_type='view', obj=self.blog)
+        created = ActionLog.objects.create(
+            action_type='update',
+            user=self.user,
+            content_object=self.blog
+        )
+        
+        self.assertEqual(built.object_id_int, self.blog.id)
+        self.assertEqual(created.object_id_int, self.blog.id)
+        
+        content_type = ContentType.objects.get_for_model(Blog)
+        logs = ActionLog.objects.filter(**ActionLog.target_filter(content_type, str(self.blog.id)))
+        self.assertIn(built, logs)
+        self.assertIn(created, logs)
+    
+    def test_get_recent_logs(self):
+        self.blog.log_action(user=self.user, action_type='view', user_agent='x' * 500)
+        
+        with self.assertNumQueries(1):
+            logs = list(self.blog.get_recent_logs(limit=2))
+            self.assertEqual(logs[0].user, self.user)
+        
+        self.assertEqual(logs[0].action_type, 'view')
+        self.assertIn('user_agent', logs[0].get_deferred_fields())
+    
+    def test_non_integer_target_ids(self):
+        content_type = ContentType.objects.get_for_model(Blog)
+        for object_id in ('²', '007', '1' * 20, 'abc'):
+            self.assertEqual(
+                ActionLog.target_filter(content_type, object_id),
+                {'content_type': content_type, 'object_id': object_id}
+            )
+        
+        request = RequestFactory().get('/')
+        request.user = self.user
+        response = ObjectLogListView.as_view()(request, content_type_id=content_type.id, object_id='²')
+        self.assertEqual(list(response.context_data['logs']), [])
+    
     def test_action_logs_relation(self):
         ActionLog.objects.create(
             action_type='create',
@@ -149,6 +230,43 @@ class ActionLogModelTest(TestCase):
         )
         
         self.assertEqual(log2.object_type, 'Немає')
+    
+    def test_bulk_create_with_logs(self):
+        ContentType.objects.get_for_model(Blog)
+        blogs = [Blog(title=f'Bulk {i}', content='Content', author=self.user) for i in range(3)]
+        
+        # Two INSERTs inside the SAVEPOINT/RELEASE pair of the atomic block.
+        with self.assertNumQueries(4):
+            Blog.bulk_create_with_logs(blogs)
+        
+        for blog in blogs:
+            log = blog.action_logs.get()
+            self.assertEqual(log.action_type, 'create')
+            self.assertEqual(log.user, self.user)
+            self.assertEqual(log.description, f'Створено блог: {blog.title}')
+    
+    def test_bulk_create_with_logs_rolls_back_on_log_failure(self):
+        blogs = [Blog(title=f'Lost {i}', content='Content', author=self.user) for i in range(2)]
+        
+        with mock.patch.object(ActionLog, 'bulk_log', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                Blog.bulk_create_with_logs(blogs)
+        
+        self.assertFalse(Blog.objects.filter(title__startswith='Lost').exists())
+    
+    def test_bulk_create_with_logs_without_returning(self):
+        blogs = [Blog(title=f'Saved {i}', content='Content', author=self.user) for i in range(2)]
+        
+        with mock.patch.object(
+            type(connection.features), 'can_return_rows_from_bulk_insert',
+            new_callable=mock.PropertyMock, return_value=False
+        ):
+            Blog.bulk_create_with_logs(blogs)
+        
+        for blog in blogs:
+            self.assertIsNotNone(blog.pk)
+            log = blog.action_logs.get()
+            self.assertEqual(log.object_id, str(blog.pk))
 
 
 class ActionLogAdminTest(TestCase):
@@ -171,6 +289,113 @@ class ActionLogAdminTest(TestCase):
         self.assertContains(response, 'Дія')
         self.assertContains(response, 'Користувач')
         self.assertContains(response, 'Об\'єкт')
+    
+    def test_admin_changelist_query_count(self):
+        def changelist_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get('/admin/action_logs/actionlog/')
+            self.assertEqual(response.status_code, 200)
+            return len(ctx.captured_queries)
+        
+        Blog.objects.create(title='First', content='Content', author=self.user)
+        baseline = changelist_queries()
+        
+        for i in range(5):
+            Blog.objects.create(title=f'Blog {i}', content='Content', author=self.user)
+        
+        self.assertEqual(changelist_queries(), baseline)
+    
+    def test_logged_model_log_counts(self):
+        blog = Blog.objects.create(title='Counted', content='Content', author=self.user)
+        ActionLog.log_action(user=self.user, action_type='view', obj=blog)
+        Blog.objects.create(title='Other', content='Content', author=self.user)
+        
+        response = self.client.get('/admin/action_logs/blog/')
+        self.assertEqual(response.status_code, 200)
+        
+        counts = {
+            row.title: row._action_logs_count
+            for row in response.context['cl'].result_list
+        }
+        self.assertEqual(counts, {'Counted': 2, 'Other': 1})
+        
+        content_type = ContentType.objects.get_for_model(Blog)
+        linked = ActionLog.objects.filter(**ActionLog.target_filter(content_type, blog.pk))
+        self.assertEqual(linked.count(), counts['Counted'])
+    
+    def test_export_as_json(self):
+        blog = Blog.objects.create(title='Exported', content='Content', author=self.user)
+        log = blog.action_logs.get()
+        
+        response = self.client.post('/admin/action_logs/actionlog/', {
+            'action': 'export_as_json',
+            '_selected_action': [str(log.id)],
+        })
+        
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(len(data), 1)
+        self.assertEqual(data[0]['id'], str(log.id))
+        self.assertEqual(data[0]['user'], 'admin')
+        self.assertEqual(data[0]['object_type'], 'blog')
+        self.assertEqual(data[0]['object_id'], str(blog.id))
+
+
+class FasterAdminPaginatorTest(TestCase):
+    
+    def setUp(self):
+        user = User.objects.create_superuser(username='admin', password='admin123', email='admin@example.com')
+        for _ in range(3):
+            ActionLog.log_action(user=user, action_type='view')
+        self.client.login(username='admin', password='admin123')
+    
+    def postgresql(self):
+        return mock.patch.object(connection, 'vendor', 'postgresql')
+    
+    def reltuples(self, estimate):
+        # The first cursor answers the pg_class lookup; any later one is a
+        # real cursor for the exact COUNT(*) fallback.
+        pg_cursor = mock.MagicMock()
+        pg_cursor.__enter__.return_value.fetchone.return_value = (estimate,)
+        pg_cursors, real_cursor = iter([pg_cursor]), connection.cursor
+        
+        def cursor():
+            return next(pg_cursors, None) or real_cursor()
+        
+        return mock.patch.object(connection, 'cursor', side_effect=cursor), pg_cursor.__enter__.return_value
+    
+    def test_unfiltered_count_uses_estimate(self):
+        cursor, pg_cursor = self.reltuples(50000)
+        with self.postgresql(), cursor:
+            count = FasterAdminPaginator(ActionLog.objects.all(), 50).count
+        
+        self.assertEqual(count, 50000)
+        self.assertIn('reltuples', pg_cursor.execute.call_args[0][0])
+    
+    def test_small_estimate_falls_back_to_exact_count(self):
+        cursor, pg_cursor = self.reltuples(5)
+        with self.postgresql(), cursor:
+            count = FasterAdminPaginator(ActionLog.objects.all(), 50).count
+        
+        self.assertEqual(count, ActionLog.objects.count())
+        pg_cursor.execute.assert_called_once()
+    
+    def test_filtered_count_is_exact(self):
+        queryset = ActionLog.objects.filter(action_type='view')
+        with self.postgresql(), CaptureQueriesContext(connection) as ctx:
+            count = FasterAdminPaginator(queryset, 50).count
+        
+        self.assertEqual(count, 3)
+        self.assertFalse(any('pg_class' in q['sql'] for q in ctx.captured_queries))
+    
+    def test_overestimated_last_page_does_not_redirect(self):
+        # reltuples lags behind deletes, so the estimate can promise pages
+        # that hold no rows any more.
+        with mock.patch.object(FasterAdminPaginator, 'count', new_callable=mock.PropertyMock, return_value=120):
+            response = self.client.get('/admin/action_logs/actionlog/?p=3')
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['cl'].result_list), [])
 
 
 class SignalTest(TestCase):
@@ -178,10 +403,11 @@ class SignalTest(TestCase):
     def test_user_save_signal(self):
         user_count_before = ActionLog.objects.count()
         
-        user = User.objects.create_user(
-            username='signal_test',
-            password='testpass'
-        )
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(
+                username='signal_test',
+                password='testpass'
+            )
         
         user_count_after = ActionLog.objects.count()
         
@@ -191,6 +417,95 @@ class SignalTest(TestCase):
         self.assertIsNotNone(log)
         self.assertEqual(log.action_type, 'create')
     
+    def test_login_logged_without_user_update(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(username='login_test', password='testpass')
+            self.client.login(username='login_test', password='testpass')
+        
+        actions = list(ActionLog.objects.filter(user=user).values_list('action_type', flat=True))
+        self.assertEqual(actions.count('login'), 1)
+        self.assertNotIn('update', actions)
+        
+        content_type = ContentType.objects.get_for_model(User)
+        login_log = ActionLog.objects.get(action_type='login', **ActionLog.target_filter(content_type, user.pk))
+        self.assertEqual(login_log.user, user)
+    
+    def test_blog_update_logged_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(username='editor', password='testpass')
+            blog = Blog.objects.create(title='Edited', content='Content', author=user)
+            
+            blog.title = 'Edited again'
+            blog.save()
+            blog.save()
+        
+        self.assertEqual(blog.action_logs.filter(action_type='update').count(), 1)
+    
+    def test_update_then_delete_leaves_no_logs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(username='short_lived', password='testpass')
+            blog = Blog.objects.create(title='Short lived', content='Content', author=user)
+            blog_id = blog.pk
+            blog.title = 'Updated'
+            blog.save()
+            blog.delete()
+        
+        content_type = ContentType.objects.get_for_model(Blog)
+        self.assertFalse(ActionLog.objects.filter(content_type=content_type, object_id=str(blog_id)).exists())
+        self.assertTrue(ActionLog.objects.filter(user=user, action_type='delete').exists())
+    
+    def test_distinct_logs_not_deduplicated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(username='deleter', password='testpass')
+            for _ in range(2):
+                Blog.objects.create(title='Same title', content='Content', author=user).delete()
+        
+        self.assertEqual(ActionLog.objects.filter(action_type='delete', user=user).count(), 2)
+    
+    def test_signal_logs_batched_until_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            users = [User.objects.create_user(username=f'batched_{i}', password='testpass') for i in range(3)]
+            self.assertFalse(ActionLog.objects.filter(user__in=users).exists())
+        
+        self.assertEqual(len(callbacks), 1)
+        with self.assertNumQueries(1):
+            callbacks[0]()
+        self.assertEqual(ActionLog.objects.filter(user__in=users, action_type='create').count(), 3)
+    
+    def test_signal_logs_dropped_on_rollback(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    User.objects.create_user(username='rolled_back', password='testpass')
+                    raise DatabaseError
+            except DatabaseError:
+                pass
+            user = User.objects.create_user(username='kept', password='testpass')
+        
+        self.assertFalse(ActionLog.objects.filter(description__contains='rolled_back').exists())
+        self.assertTrue(ActionLog.objects.filter(user=user).exists())
+    
+    def test_signal_logs_written_after_request(self):
+        request_started.send(sender=self.__class__)
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(username='in_request', password='testpass')
+        
+        self.assertFalse(ActionLog.objects.filter(user=user).exists())
+        request_finished.send(sender=self.__class__)
+        self.assertTrue(ActionLog.objects.filter(user=user, action_type='create').exists())
+    
+    def test_register_model_signals(self):
+        register_model_signals(Comment)
+        self.addCleanup(post_save.disconnect, sender=Comment, dispatch_uid='log_model_save_action_logs.Comment')
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.create_user(username='commenter', password='testpass')
+            blog = Blog.objects.create(title='Commented', content='Content', author=user)
+            comment = Comment.objects.create(blog=blog, author=user, text='Registered')
+        
+        log = ActionLog.objects.get(description__startswith='Create Comment')
+        self.assertEqual(log.user, user)
+        self.assertEqual(log.content_object, comment)
+    
     def test_blog_delete_signal(self):
         user = User.objects.create_user(username='bloguser', password='testpass')
         blog = Blog.objects.create(
@@ -200,7 +515,8 @@ class SignalTest(TestCase):
         )
         
         blog_id = blog.id
-        blog.delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            blog.delete()
         
         log = ActionLog.objects.filter(
             description__contains='Signal Test Blog'
@@ -208,3 +524,224 @@ class SignalTest(TestCase):
         
         self.assertIsNotNone(log)
         self.assertEqual(log.action_type, 'delete')
+
+
+class CommitBatchTest(TransactionTestCase):
+    
+    def test_batch_not_reused_after_rollback(self):
+        try:
+            with transaction.atomic():
+                User.objects.create_user(username='rolled_back', password='testpass')
+                raise DatabaseError
+        except DatabaseError:
+            pass
+        
+        with transaction.atomic():
+            user = User.objects.create_user(username='committed', password='testpass')
+        
+        self.assertFalse(ActionLog.objects.filter(description__contains='rolled_back').exists())
+        self.assertTrue(ActionLog.objects.filter(user=user, action_type='create').exists())
+
+
+class RequestFinishedFlushTest(TransactionTestCase):
+    
+    def test_connection_closed_after_flush(self):
+        user = User.objects.create_user(username='flusher', password='testpass')
+        batcher.enqueue(ActionLog.build_log(user=user, action_type='view'))
+        logged_at_close = []
+        
+        # With CONN_MAX_AGE=0 the connection is obsolete as soon as it is
+        # opened, so close_old_connections() closes it on request_finished.
+        with mock.patch.object(connection, 'close') as close:
+            close.side_effect = lambda: logged_at_close.append(
+                ActionLog.objects.filter(user=user, action_type='view').exists()
+            )
+            request_finished.send(sender=self.__class__)
+        
+        # Django's own receiver closes before the flush reopens it; the
+        # last close must come after the logs were written.
+        self.assertTrue(logged_at_close[-1])
+
+
+class LoggedBlogDetailView(ActionLoggingMixin, DetailView):
+    model = Blog
+
+
+class LoggedBlogCreateView(ActionLoggingMixin, CreateView):
+    model = Blog
+    fields = ['title', 'content']
+    action_type = 'create'
+
+
+class ActionLoggingMixinTest(TestCase):
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='viewer', password='testpass')
+        self.blog = Blog.objects.create(title='Viewed', content='Content', author=self.user)
+        self.factory = RequestFactory()
+    
+    def get(self, view, user_agent, **kwargs):
+        request = self.factory.get('/', HTTP_USER_AGENT=user_agent)
+        request.user = self.user
+        return view.as_view()(request, **kwargs)
+    
+    def test_log_written_when_request_finishes(self):
+        request_started.send(sender=self.__class__)
+        self.get(LoggedBlogDetailView, 'TestAgent', pk=self.blog.pk)
+        self.assertFalse(ActionLog.objects.filter(user_agent='TestAgent').exists())
+        
+        request_finished.send(sender=self.__class__)
+        log = ActionLog.objects.filter(user=self.user, user_agent='TestAgent').get()
+        self.assertEqual(log.action_type, 'view')
+        self.assertEqual(log.content_object, self.blog)
+        self.assertEqual(log.additional_data['view_class'], 'LoggedBlogDetailView')
+        self.assertEqual(log.additional_data['status_code'], 200)
+    
+    def test_log_written_outside_request(self):
+        self.get(LoggedBlogDetailView, 'NoRequestCycle', pk=self.blog.pk)
+        self.assertTrue(ActionLog.objects.filter(user_agent='NoRequestCycle').exists())
+        self.assertEqual(batcher.pending(), [])
+    
+    def test_form_render_not_logged(self):
+        self.get(LoggedBlogCreateView, 'FormRender')
+        self.assertFalse(ActionLog.objects.filter(user_agent='FormRender').exists())
+
+
+class OwnerRequiredMixinTest(TestCase):
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='testpass')
+        self.blog = Blog.objects.create(title='Owned Blog', content='Content', author=self.user)
+        self.factory = RequestFactory()
+    
+    def test_object_fetched_once(self):
+        request = self.factory.post(f'/blogs/{self.blog.pk}/delete/')
+        request.user = self.user
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = BlogDeleteView.as_view()(request, pk=self.blog.pk)
+        
+        self.assertEqual(response.status_code, 302)
+        blog_selects = [
+            q['sql'] for q in ctx.captured_queries
+            if q['sql'].startswith('SELECT') and 'FROM "action_logs_blog"' in q['sql']
+        ]
+        self.assertEqual(len(blog_selects), 1)
+
+
+class DashboardViewTest(TestCase):
+    
+    def test_activity_summary(self):
+        user = User.objects.create_user(username='dashboard', password='testpass')
+        old_log = ActionLog.log_action(user=user, action_type='view')
+        ActionLog.objects.filter(pk=old_log.pk).update(timestamp=timezone.now() - timedelta(days=60))
+        recent_log = ActionLog.log_action(user=user, action_type='view')
+        
+        request = RequestFactory().get('/dashboard/')
+        request.user = user
+        context = DashboardView.as_view()(request).context_data
+        
+        self.assertEqual(context['activity_count'], 1)
+        self.assertEqual(context['last_activity'], recent_log.timestamp)
+
+
+class ActionLogListViewTest(TestCase):
+    
+    def setUp(self):
+        self.user = User.objects.create_user(username='lister', password='testpass')
+        self.factory = RequestFactory()
+        for _ in range(5):
+            ActionLog.log_action(user=self.user, action_type='view')
+    
+    def get_context(self, query_string):
+        # The query string is used as-is, like a template writing
+        # ?after={{ next_cursor }} without urlencode.
+        request = self.factory.get(f'/logs/?{query_string}')
+        request.user = self.user
+        return ActionLogListView.as_view()(request).context_data
+    
+    def test_keyset_pagination(self):
+        expected = list(ActionLog.objects.order_by('-timestamp', '-id'))
+        
+        first_page = self.get_context('per_page=2')
+        self.assertEqual(list(first_page['logs']), expected[:2])
+        
+        with CaptureQueriesContext(connection) as ctx:
+            second_page = self.get_context(f"per_page=2&after={first_page['next_cursor']}")
+        
+        self.assertEqual(list(second_page['logs']), expected[2:4])
+        self.assertIsNotNone(second_page['next_cursor'])
+        self.assertFalse(any('OFFSET' in q['sql'] for q in ctx.captured_queries))
+        
+        last_page = self.get_context(f"per_page=2&after={second_page['next_cursor']}")
+        self.assertEqual(list(last_page['logs']), expected[4:])
+        self.assertIsNone(last_page['next_cursor'])
+    
+    def test_keyset_pagination_three_fields(self):
+        ActionLog.log_action(user=self.user, action_type='create')
+        ActionLog.log_action(user=self.user, action_type='create')
+        
+        class ByActionLogListView(ActionLogListView):
+            cursor_fields = ('action_type', 'timestamp', 'id')
+        
+        expected = list(ActionLog.objects.order_by('-action_type', '-timestamp', '-id'))
+        seen, query_string = [], 'per_page=2'
+        while True:
+            request = self.factory.get(f'/logs/?{query_string}')
+            request.user = self.user
+            context = ByActionLogListView.as_view()(request).context_data
+            seen.extend(context['logs'])
+            if context['next_cursor'] is None:
+                break
+            query_string = f"per_page=2&after={context['next_cursor']}"
+        
+        self.assertEqual(seen, expected)
+    
+    def test_cursor_with_non_positive_page_size(self):
+        first_page = self.get_context('per_page=2')
+        
+        context = self.get_context(f"per_page=-1&after={first_page['next_cursor']}")
+        
+        self.assertEqual(len(context['logs']), 1)
+    
+    def test_invalid_cursor(self):
+        for cursor in ('garbage', urlsafe_base64_encode(b'not-a-date,not-a-uuid')):
+            with self.assertRaises(Http404):
+                self.get_context(f'after={cursor}')
+
+
+class BlogListViewTest(TestCase):
+    
+    def test_list_defers_content(self):
+        user = User.objects.create_user(username='blogger', password='testpass')
+        Blog.objects.create(title='Listed', content='Long content', author=user)
+        request = RequestFactory().get('/blogs/')
+        request.user = user
+        
+        blogs = list(BlogListView.as_view()(request).context_data['blogs'])
+        
+        with self.assertNumQueries(0):
+            self.assertEqual(blogs[0].author.username, 'blogger')
+        self.assertIn('content', blogs[0].get_deferred_fields())
+
+
+class CreateTestDataCommandTest(TestCase):
+    
+    def setUp(self):
+        # The commands directory is not a discoverable package, so the
+        # command is loaded directly.
+        module = import_module('action_logs.managment.commands.create_test_data')
+        module.Command(stdout=StringIO()).handle(users=2, blogs=2, comments=2, logs=5)
+        self.targeted = ActionLog.objects.exclude(object_id=None)
+    
+    def test_logs_have_integer_target_ids(self):
+        self.assertTrue(self.targeted.exists())
+        self.assertFalse(self.targeted.filter(object_id_int=None).exists())
+    
+    def test_logs_have_object_repr(self):
+        self.assertFalse(self.targeted.filter(object_repr='').exists())
+        
+        logs = list(self.targeted.select_related('user'))
+        with self.assertNumQueries(0):
+            for log in logs:
+                str(log)
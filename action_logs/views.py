@@ -6,13 +6,26 @@ from django.utils.decorators import method_decorator
 from .models import ActionLog, Blog, Comment, UserProfile
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import User
+from django.db.models import Count, Max
+from django.utils import timezone
+from datetime import datetime, time, timedelta
 from .mixins import (
     OwnerRequiredMixin, AutoAuthorMixin, QueryFilterMixin, 
-    JSONResponseMixin, PublicPrivateMixin, EnhancedPaginationMixin,
-    RelatedObjectsMixin, ObjectLogsMixin, ActionLoggingMixin
+    JSONResponseMixin, PublicPrivateMixin, EnhancedPaginationMixin, KeysetPaginationMixin,
+    RelatedObjectsMixin, ObjectLogsMixin
 )
 
-class ActionLogListView(LoginRequiredMixin, QueryFilterMixin, EnhancedPaginationMixin, ListView):
+LOG_LIST_FIELDS = (
+    'id', 'action_type', 'timestamp', 'object_id', 'object_repr', 'description',
+    'user__username', 'content_type__app_label', 'content_type__model',
+)
+
+
+def with_log_relations(queryset):
+    return queryset.select_related('user', 'content_type').prefetch_related('content_object').only(*LOG_LIST_FIELDS)
+
+
+class ActionLogListView(LoginRequiredMixin, QueryFilterMixin, KeysetPaginationMixin, EnhancedPaginationMixin, ListView):
     model = ActionLog
     template_name = 'action_logs/log_list.html'
     context_object_name = 'logs'
@@ -22,6 +35,9 @@ class ActionLogListView(LoginRequiredMixin, QueryFilterMixin, EnhancedPagination
     search_fields = ['action_type', 'additional_data']
     date_range_field = 'timestamp'
 
+    def get_queryset(self):
+        return with_log_relations(super().get_queryset())
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['action_types'] = ActionLog.ACTION_TYPES
@@ -30,6 +46,7 @@ class ActionLogListView(LoginRequiredMixin, QueryFilterMixin, EnhancedPagination
 
 class BlogListView(PublicPrivateMixin, EnhancedPaginationMixin, ListView):
     model = Blog
+    queryset = Blog.objects.only('id', 'title', 'author', 'created_at', 'is_published').select_related('author')
     template_name = 'action_logs/blog_list.html'
     context_object_name = 'blogs'
     paginate_by = 10
@@ -56,19 +73,12 @@ class BlogDetailView(RelatedObjectsMixin, ObjectLogsMixin, DetailView):
     logs_limit = 5
     include_logs = True
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        blog = self.get_object()
-        context['comments'] = blog.comments.filter(is_active=True)
-        return context
-
 
-class BlogCreateView(LoginRequiredMixin, AutoAuthorMixin, ActionLoggingMixin, CreateView):
+class BlogCreateView(LoginRequiredMixin, AutoAuthorMixin, CreateView):
     model = Blog
     template_name = 'action_logs/blog_form.html'
     fields = ['title', 'content', 'is_published', 'tags']
     success_url = reverse_lazy('blog_list')
-    action_type = 'create'
 
 class BlogUpdateView(LoginRequiredMixin, OwnerRequiredMixin, UpdateView):
     model = Blog
@@ -107,8 +117,7 @@ class ObjectLogListView(LoginRequiredMixin, ListView):
         object_id = self.kwargs['object_id']
 
         return ActionLog.objects.filter(
-            content_type_id=content_type_id,
-            object_id=object_id
+            **ActionLog.target_filter(content_type_id, object_id)
         ).select_related('user', 'content_type')
 
     def get_context_data(self, **kwargs):
@@ -125,18 +134,32 @@ class ObjectLogListView(LoginRequiredMixin, ListView):
 
 class DashboardView(LoginRequiredMixin, ListView):
     template_name = 'action_logs/dashboard.html'
+    activity_days = 30
 
     def get_queryset(self):
         return ActionLog.objects.none()
 
+    def get_activity_since(self):
+        # Whole-day boundary compared against the raw column, so the
+        # (user, -timestamp) index serves the range directly.
+        start_day = timezone.localdate() - timedelta(days=self.activity_days)
+        return timezone.make_aware(datetime.combine(start_day, time.min))
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
 
-        context['recent_logs'] = ActionLog.objects.all()[:10]
-        context['user_blogs'] = Blog.objects.filter(author=user)[:5]
-        context['user_comments'] = Comment.objects.filter(author=user)[:5]
-        context['activity_count'] = ActionLog.objects.filter(user=user).count()
+        context['recent_logs'] = with_log_relations(ActionLog.objects.all())[:10]
+        context['user_blogs'] = Blog.objects.filter(author=user).defer('content')[:5]
+        context['user_comments'] = Comment.objects.filter(author=user).select_related('author', 'blog').defer('blog__content')[:5]
+        context['activity_days'] = self.activity_days
+        context.update(ActionLog.objects.filter(
+            user=user,
+            timestamp__gte=self.get_activity_since()
+        ).aggregate(
+            activity_count=Count('id'),
+            last_activity=Max('timestamp')
+        ))
 
         return context
     